@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -81,6 +82,13 @@ DATABASES = {
     }
 }
 
+# Opt-in on-disk test database, so `manage.py test --keepdb` can reuse the
+# schema between runs (SQLite's default in-memory one can't be kept).
+if os.environ.get('POLLS_TEST_DB_NAME'):
+    DATABASES['default']['TEST'] = {
+        'NAME': BASE_DIR / os.environ['POLLS_TEST_DB_NAME'],
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
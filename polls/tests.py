@@ -1,24 +1,73 @@
 import datetime
+import functools
 
-from django.test import TestCase
+from django.test import RequestFactory, SimpleTestCase, TestCase
 from django.utils import timezone
 from django.urls import reverse
 
 from .models import Question
+from .views import DetailView
 
-def create_question(question_text, days):
+
+@functools.lru_cache(maxsize=None)
+def _td(days):
+    return datetime.timedelta(days=days)
+
+
+_NEAR_DAY = datetime.timedelta(hours=23, minutes=59, seconds=59)
+_OVER_DAY = datetime.timedelta(days=1, seconds=1)
+
+
+def create_questions_at(now, specs):
     """
-    Create a question with the given `question_text` and published the
-    given number of `days` offset to now (negative for questions published
-    in the past, positive for questions that have yet to be published).
-    
-    Función auxiliar que permite crear una pregunta.
-    Recibe el texto de la pregunta y los días que han pasado o faltan
-    desde o para publicarla. (Un valor negativo significa que ya se publico,
-    un valor positivo significa que se tenfrá que publicar en el futuro.)
+    Create several questions with a single INSERT, offsetting each one from
+    the same `now`. `specs` is a list of (question_text, days) pairs.
+
+    Crea varias preguntas de una sola vez, todas relativas al mismo `now`.
     """
-    time = timezone.now() + datetime.timedelta(days=days)
-    return Question.objects.create(question_text=question_text, pub_date=time)
+    return Question.objects.bulk_create([
+        Question(question_text=question_text, pub_date=now + _td(days))
+        for question_text, days in specs
+    ])
+
+
+class PollsTestBase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Set before super().setUpClass(), which is where TestCase runs
+        # setUpTestData.
+        cls._now = timezone.now()
+        cls.index_url = reverse('polls:index')
+        super().setUpClass()
+
+    @classmethod
+    def create_question(cls, question_text, days):
+        """
+        Create a question with the given `question_text` and published the
+        given number of `days` offset to now (negative for questions published
+        in the past, positive for questions that have yet to be published).
+        
+        Función auxiliar que permite crear una pregunta.
+        Recibe el texto de la pregunta y los días que han pasado o faltan
+        desde o para publicarla. (Un valor negativo significa que ya se publico,
+        un valor positivo significa que se tenfrá que publicar en el futuro.)
+        """
+        time = cls._now + _td(days)
+        return Question.objects.create(question_text=question_text, pub_date=time)
+
+    def assertLatestQuestions(self, response, questions):
+        """
+        Compare the index page's question list with `questions` by primary
+        key. The template has already evaluated the queryset, so this reuses
+        its cached rows instead of running a new query.
+
+        Compara por clave primaria las preguntas de la página principal con
+        `questions`.
+        """
+        self.assertEqual(
+            [q.pk for q in response.context['latest_question_list']],
+            [q.pk for q in questions],
+        )
 
 
 """Test para la clase DetailView
@@ -46,20 +95,27 @@ el texto de la pregunta. Esto se consigue en el template detail.html en la prime
 """
 
 
-class QuestionDetailViewTests(TestCase):
+class QuestionDetailViewTests(PollsTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.future = cls.create_question(question_text='Future question.', days=5)
+        cls.future_url = reverse('polls:detail', args=(cls.future.id,))
+        cls.past = cls.create_question(question_text='Past Question.', days=-5)
+        cls.past_detail_url = reverse('polls:detail', args=(cls.past.id,))
+
     def test_future_question(self):
         """
         The detail view of a question with a pub_date in the future
-        returns a 404 not found.
+        returns a 404 not found, because the view's queryset excludes it.
 
         En este test se comprueba que si accedemos a detalle de una pregunta 
         con fecha de publicación en el futuro (todavía no se ha publicado),
-        nos devuelve un 404. 
+        nos devuelve un 404: la consulta de la vista no la selecciona.
         """
-        future_question = create_question(
-            question_text='Future question.', days=5)
-        url = reverse('polls:detail', args=(future_question.id,))
-        response = self.client.get(url)
+        self.assertFalse(
+            DetailView().get_queryset().filter(pk=self.future.pk).exists()
+        )
+        response = self.client.get(self.future_url)
         self.assertEqual(response.status_code, 404)
 
     def test_past_question(self):
@@ -70,11 +126,11 @@ class QuestionDetailViewTests(TestCase):
         Cuando intentamos ver el detalle de una pregunta publicada 
         en el pasado se debe ver el texto de la pregunta.
         """
-        past_question = create_question(
-            question_text='Past Question.', days=-5)
-        url = reverse('polls:detail', args=(past_question.id,))
-        response = self.client.get(url)
-        self.assertContains(response, past_question.question_text)
+        request = RequestFactory().get(self.past_detail_url)
+        response = DetailView.as_view()(request, pk=self.past.pk)
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.past.question_text.encode('utf-8'), response.content)
 
 """Test para la clase IndexView
 La clase IndexView es la encargada de mostrar las preguntas publicadas.
@@ -102,7 +158,7 @@ En la página principal aparece el mensaje "No polls are available.".
 
 """
 
-class QuestionIndexViewTests(TestCase):
+class QuestionIndexViewTests(PollsTestBase):
     def test_no_questions(self):
         """
         If no questions exist, an appropriate message is displayed.
@@ -110,25 +166,10 @@ class QuestionIndexViewTests(TestCase):
         Si no hay preguntas en la base de datos debe aparecer el mensaje 
         "No polls are available."
         """
-        response = self.client.get(reverse('polls:index'))
+        response = self.client.get(self.index_url)
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "No polls are available.")
-        self.assertQuerysetEqual(response.context['latest_question_list'], [])
-
-    def test_past_question(self):
-        """
-        Questions with a pub_date in the past are displayed on the
-        index page.
-
-        Las preguntas con fecha de publicación en el pasado debe aparecer en 
-        la página principal.
-        """
-        question = create_question(question_text="Past question.", days=-30)
-        response = self.client.get(reverse('polls:index'))
-        self.assertQuerysetEqual(
-            response.context['latest_question_list'],
-            [question],
-        )
+        self.assertIn(b"No polls are available.", response.content)
+        self.assertLatestQuestions(response, [])
 
     def test_future_question(self):
         """
@@ -138,40 +179,52 @@ class QuestionIndexViewTests(TestCase):
         Las preguntas con fecha de publicación en el futuro, no deben 
         aparecer en la página principal.
         """
-        create_question(question_text="Future question.", days=30)
-        response = self.client.get(reverse("polls:index"))
-        self.assertContains(response, "No polls are available.")
-        self.assertQuerySetEqual(response.context["latest_question_list"], [])
+        self.create_question(question_text="Future question.", days=30)
+        response = self.client.get(self.index_url)
+        self.assertLatestQuestions(response, [])
 
-    def test_future_question_and_past_question(self):
+
+class QuestionIndexViewPastQuestionTests(PollsTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.past = cls.create_question(question_text="Past question.", days=-30)
+
+    def test_past_question(self):
         """
-        Even if both past and future questions exist, only past questions
-        are displayed.
+        Questions with a pub_date in the past are displayed on the
+        index page.
 
-        Si tenemos una pregunta publicada en el pasado y otra en el futuro.
-        Sólo debe aparecer la publicada en el pasado.
+        Las preguntas con fecha de publicación en el pasado debe aparecer en 
+        la página principal.
         """
-        question1 = create_question(question_text="Past question 1.", days=-30)
-        question2 = create_question(question_text="Past question 2.", days=-5)
-        response = self.client.get(reverse("polls:index"))
-        self.assertQuerySetEqual(
-            response.context["latest_question_list"],
-            [question2, question1],
-        )
+        response = self.client.get(self.index_url)
+        self.assertLatestQuestions(response, [self.past])
+
+
+class QuestionIndexViewTwoPastQuestionsTests(PollsTestBase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.question1, cls.question2 = create_questions_at(cls._now, [
+            ("Past question 1.", -30),
+            ("Past question 2.", -5),
+        ])
 
     def test_two_past_questions(self):
         """
-        The questions index page may display multiple questions.
+        The questions index page may display multiple questions, and
+        even if future questions also exist, only past questions are
+        displayed.
 
-        Si tenemos varias preguntas en el pasado deben aparecer en la página principal.
+        Si tenemos varias preguntas en el pasado deben aparecer en la página
+        principal, aunque también haya una publicada en el futuro.
         """
-        question1 = create_question(question_text="Past question 1.", days=-30)
-        question2 = create_question(question_text="Past question 2.", days=-5)
-        response = self.client.get(reverse("polls:index"))
-        self.assertQuerySetEqual(
-            response.context["latest_question_list"],
-            [question2, question1],
-        )
+        for with_future in (False, True):
+            with self.subTest(with_future=with_future):
+                if with_future:
+                    self.create_question(question_text="Future question.", days=30)
+                response = self.client.get(self.index_url)
+                self.assertLatestQuestions(
+                    response, [self.question2, self.question1])
 
 """ Test sobre el modele de datos
 
@@ -196,40 +249,27 @@ debe devolver False.
 debe devolver True.
 
 """
-class QuestionModelTests(TestCase):
+class QuestionModelTests(SimpleTestCase):
+    databases = set()
 
-    def test_was_published_recently_with_future_question(self):
+    def test_was_published_recently(self):
         """
         was_published_recently() returns False for questions whose pub_date
-        is in the future.
-
-        Las preguntas publicadas en una fecha futura, la función 
-        was_published_recently() debe devolver False
-        """
-        time = timezone.now() + datetime.timedelta(days=30)
-        future_question = Question(pub_date=time)
-        self.assertIs(future_question.was_published_recently(), False)
+        is in the future or older than 1 day, and True for questions whose
+        pub_date is within the last day.
 
-    def test_was_published_recently_with_old_question(self):
-        """
-        was_published_recently() returns False for questions whose pub_date
-        is older than 1 day.
-        
-        En las preguntas publicadas hace más de 1 día, la función 
-        was_published_recently() debe devolver False.
-        """
-        time = timezone.now() - datetime.timedelta(days=1, seconds=1)
-        old_question = Question(pub_date=time)
-        self.assertIs(old_question.was_published_recently(), False)
-
-    def test_was_published_recently_with_recent_question(self):
-        """
-        was_published_recently() returns True for questions whose pub_date
-        is within the last day.
-        
-        En las preguntas publicadas hace un 1 día, la función 
-        was_published_recently() debe devolver True.
+        Las preguntas publicadas en una fecha futura o hace más de 1 día,
+        la función was_published_recently() debe devolver False. En las
+        publicadas hace un 1 día debe devolver True.
         """
-        time = timezone.now() - datetime.timedelta(hours=23, minutes=59, seconds=59)
-        recent_question = Question(pub_date=time)
-        self.assertIs(recent_question.was_published_recently(), True)
+        # Taken here rather than per class: the recent case is only one second
+        # inside was_published_recently()'s window, which reads the clock again.
+        now = timezone.now()
+        for delta, expected in [
+            (_td(30), False),
+            (-_OVER_DAY, False),
+            (-_NEAR_DAY, True),
+        ]:
+            with self.subTest(delta=delta):
+                question = Question(pub_date=now + delta)
+                self.assertIs(question.was_published_recently(), expected)